@@ -13,5 +13,12 @@ COMPLETE_TASKS: bool = True
 # True - if you want to program log more information
 DEBUG: bool = False
 
+# True - if you want to profile CPU and memory of each phase per account
+# (on Python 3.12+ phases of concurrent accounts are timed but not profiled)
+PROFILE: bool = False
+
+# The directory for the pstats files and the merged profiling report
+PROFILE_DIR: str = ".profile"
+
 # The keywords URL
 KEYWORDS_URL: str = "https://automate-blum-default-rtdb.firebaseio.com/keywords.json"
@@ -6,11 +6,13 @@ from rich.console import Console
 from rich.traceback import install
 
 from utils.blum import Blum
+from utils.core.profiler import profiler
 from utils.core.telegram import Telegram
 
 install()
 
 console: Console = Console()
+profiler.start()
 telegram: Telegram = Telegram()
 
 if web_data := asyncio.run(telegram.get_web_data("BlumCryptoBot", "app")):
@@ -25,3 +27,5 @@ if web_data := asyncio.run(telegram.get_web_data("BlumCryptoBot", "app")):
 
     for thread in threads:
         thread.join()
+
+profiler.dump()
@@ -1,6 +1,9 @@
+import json
+import threading
 import time
 from random import randint
 from typing import Dict, List, Literal, Self, Union
+from urllib.parse import parse_qs
 
 import cloudscraper
 from rich.console import Console
@@ -8,6 +11,7 @@ from rich.console import Console
 import config
 
 from .core.logger import logger
+from .core.profiler import profiler
 from .payload import create_payload_local
 
 scraper = cloudscraper.create_scraper()  # Create a scraper session
@@ -21,16 +25,17 @@ class Blum:
 
     def login(self: Self, timeout: int = 5):
         try:
-            response = scraper.post(
-                url="https://user-domain.blum.codes/api/v1/auth/provider/PROVIDER_TELEGRAM_MINI_APP",
-                json={"query": self.web_data},
-                timeout=25,
-            )
+            with profiler.phase("login", self.user_id):
+                response = scraper.post(
+                    url="https://user-domain.blum.codes/api/v1/auth/provider/PROVIDER_TELEGRAM_MINI_APP",
+                    json={"query": self.web_data},
+                    timeout=25,
+                )
 
-            if response.ok:
-                if data := response.json():
-                    token = data["token"]["access"]
-                    return token
+                if response.ok:
+                    if data := response.json():
+                        token = data["token"]["access"]
+                        return token
 
         except Exception:
             logger.error(f"Unable to login!")
@@ -40,11 +45,12 @@ class Blum:
                 return self.login(timeout - 1)
 
     def is_token_valid(self: Self, token: str):
-        response = scraper.get(
-            "https://user-domain.blum.codes/api/v1/user/me",
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=25,
-        )
+        with profiler.phase("token", self.user_id):
+            response = scraper.get(
+                "https://user-domain.blum.codes/api/v1/user/me",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=25,
+            )
 
         return True if response.ok else False
 
@@ -62,6 +68,17 @@ class Blum:
 
         return self.token
 
+    @property
+    def user_id(self: Self) -> str:
+        if not hasattr(self, "_user_id"):
+            try:
+                user = json.loads(parse_qs(self.web_data)["user"][0])
+                self._user_id: str = str(user["id"])
+            except Exception:
+                return threading.current_thread().name
+
+        return self._user_id
+
     @property
     def username(self: Self):
         if not hasattr(self, "_username"):
@@ -77,22 +94,24 @@ class Blum:
         return self._username
 
     def get_me(self: Self):
-        scraper.options("https://user-domain.blum.codes/api/v1/user/me")
-        response = scraper.get(
-            "https://user-domain.blum.codes/api/v1/user/me",
-            headers={"Authorization": f"Bearer {self.token}"},
-            timeout=25,
-        )
+        with profiler.phase("user", self.user_id):
+            scraper.options("https://user-domain.blum.codes/api/v1/user/me")
+            response = scraper.get(
+                "https://user-domain.blum.codes/api/v1/user/me",
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=25,
+            )
 
         if response.ok:
             return response.json()
 
     def get_balance(self: Self):
-        response = scraper.get(
-            f"https://wallet-domain.blum.codes/api/v1/wallet/my/points/balance",
-            headers={"Authorization": f"Bearer {self.token}"},
-            timeout=25,
-        )
+        with profiler.phase("balance", self.user_id):
+            response = scraper.get(
+                f"https://wallet-domain.blum.codes/api/v1/wallet/my/points/balance",
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=25,
+            )
 
         if response.ok:
             return response.json()
@@ -106,13 +125,14 @@ class Blum:
                     return point["balance"], symbol
 
     def play_game(self: Self, timeout: int = 5):
-        response = scraper.post(
-            "https://game-domain.blum.codes/api/v2/game/play",
-            headers={
-                "Authorization": f"Bearer {self.token}",
-            },
-            timeout=25,
-        )
+        with profiler.phase("game.play", self.user_id):
+            response = scraper.post(
+                "https://game-domain.blum.codes/api/v2/game/play",
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                },
+                timeout=25,
+            )
 
         try:
             data = response.json()
@@ -179,9 +199,11 @@ class Blum:
             bombs = randint(0, 1) if multiplier >= 3 else 0
             points = clover * multiplier - bombs * 100
             freeze = randint(0, 5)
-            data = create_payload_local(
-                game_id=game_id, clover=clover, freeze=freeze, bombs=bombs
-            )
+
+            with profiler.phase("game.payload", self.user_id):
+                data = create_payload_local(
+                    game_id=game_id, clover=clover, freeze=freeze, bombs=bombs
+                )
 
             sleep = 30 + freeze * 3
             logger.info(
@@ -189,14 +211,15 @@ class Blum:
             )
             time.sleep(sleep)
 
-            response = scraper.post(
-                "https://game-domain.blum.codes/api/v2/game/claim",
-                json={"payload": data},
-                headers={
-                    "Authorization": f"Bearer {self.token}",
-                },
-                timeout=25,
-            )
+            with profiler.phase("game.claim", self.user_id):
+                response = scraper.post(
+                    "https://game-domain.blum.codes/api/v2/game/claim",
+                    json={"payload": data},
+                    headers={
+                        "Authorization": f"Bearer {self.token}",
+                    },
+                    timeout=25,
+                )
 
             if response.ok:
                 if response.text == "OK":
@@ -387,7 +410,8 @@ class Blum:
             self.start_game()
 
         if config.COMPLETE_TASKS:
-            self.complete_tasks()
+            with profiler.phase("tasks", self.user_id):
+                self.complete_tasks()
 
 
 def main():
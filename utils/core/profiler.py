@@ -0,0 +1,326 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from types import TracebackType
+from typing import Dict, List, Self, Tuple, Type, Union
+
+import config
+
+from .logger import logger
+
+# The profiler's own functions that show up in the profiles of the phases.
+OWN: Tuple[str, ...] = (
+    "__init__",
+    "__enter__",
+    "__exit__",
+    "enabled",
+    "phase",
+    "enter",
+    "exit",
+    "pause",
+    "resume",
+    "stack",
+)
+
+
+class Profile(cProfile.Profile):
+    """cProfile without the frames of the profiler itself."""
+
+    def snapshot_stats(self: Self) -> None:
+        super().snapshot_stats()
+
+        for func in [func for func in self.stats if Profile.own(func)]:
+            del self.stats[func]
+
+        for *_, callers in self.stats.values():
+            for func in [func for func in callers if Profile.own(func)]:
+                del callers[func]
+
+    @staticmethod
+    def own(func: Tuple[str, int, str]) -> bool:
+        filename, _, name = func
+
+        if filename == "~":
+            return name.endswith("of '_lsprof.Profiler' objects>")
+
+        return filename == __file__ and name in OWN
+
+
+class Phase(object):
+    """
+    A single profiled run of a phase, used as a ``with`` block.
+
+    The cProfile instance is paused while a nested phase runs, so functions
+    are attributed to the innermost phase. Nothing is set up while profiling
+    is disabled.
+    """
+
+    def __init__(
+        self: Self, profiler: "Profiler", name: str, account: Union[str, None]
+    ):
+        self.profiler: "Profiler" = profiler
+        self.name: str = name
+        self.account: Union[str, None] = account
+
+        self.profile: Union[Profile, None] = None
+        self.profiled: bool = False
+        self.active: bool = False
+        self.peak: int = 0
+        self.start: float = 0.0
+        self.cpu_start: float = 0.0
+
+    def __enter__(self: Self) -> Self:
+        if self.profiler.enabled:
+            try:
+                self.profiler.enter(self)
+                self.active = True
+            except Exception as err:
+                logger.warning(f"Unable to profile phase {self.name!r}: {err}")
+
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: Union[Type[BaseException], None],
+        exc_value: Union[BaseException, None],
+        traceback: Union[TracebackType, None],
+    ) -> None:
+        if self.active:
+            try:
+                self.profiler.exit(self)
+            except Exception as err:
+                logger.warning(f"Unable to profile phase {self.name!r}: {err}")
+
+
+class Local(threading.local):
+    """The phases running in the current thread, innermost last."""
+
+    def __init__(self: Self):
+        self.stack: List[Phase] = []
+
+
+class Record(object):
+    """Accumulated results of every run of one phase for one account."""
+
+    def __init__(self: Self):
+        self.calls: int = 0
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        self.peak: int = 0
+        self.profiled: bool = False
+        self.stats: pstats.Stats = pstats.Stats()
+
+
+class Profiler(object):
+    """
+    Opt-in per-phase, per-account cProfile hooks and a process-level
+    tracemalloc summary.
+
+    Every thread keeps its own stack of phases. Wall and CPU time are per
+    thread and include nested phases. Tracemalloc is process wide, so the
+    peak of a phase is the traced memory of the whole process while it ran.
+
+    Concurrent cProfile instances need Python 3.11; from 3.12 on only one can
+    be active in the interpreter, so phases overlapping another thread's phase
+    are timed but not profiled.
+    """
+
+    TOP: int = 25
+    FRAMES: int = 4
+
+    def __init__(self: Self, directory: str = ".profile"):
+        self.directory: str = directory
+        self.records: Dict[Tuple[str, str], Record] = {}
+        self.active: List[Phase] = []
+        self.lock: threading.Lock = threading.Lock()
+        self.local: Local = Local()
+        self.warned: bool = False
+
+    @property
+    def enabled(self: Self) -> bool:
+        return config.PROFILE
+
+    @property
+    def stack(self: Self) -> List[Phase]:
+        return self.local.stack
+
+    def phase(self: Self, name: str, account: Union[str, None] = None) -> Phase:
+        return Phase(self, name, account)
+
+    def start(self: Self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(Profiler.FRAMES)
+
+    def enter(self: Self, current: Phase) -> None:
+        stack: List[Phase] = self.stack
+
+        if stack:
+            self.pause(stack[-1])
+
+            if current.account is None:
+                current.account = stack[-1].account
+
+        with self.lock:
+            self.observe()
+            self.active.append(current)
+
+        stack.append(current)
+
+        current.start = time.perf_counter()
+        current.cpu_start = time.thread_time()
+        self.resume(current)
+
+    def exit(self: Self, current: Phase) -> None:
+        self.pause(current)
+        wall: float = time.perf_counter() - current.start
+        cpu: float = time.thread_time() - current.cpu_start
+
+        stack: List[Phase] = self.stack
+        stack.remove(current)
+
+        with self.lock:
+            self.observe()
+            self.active.remove(current)
+
+            record: Record = self.records.setdefault(
+                (current.account or threading.current_thread().name, current.name),
+                Record(),
+            )
+            record.calls += 1
+            record.wall += wall
+            record.cpu += cpu
+            record.peak = max(record.peak, current.peak)
+
+            if current.profile is not None and current.profiled:
+                record.profiled = True
+                record.stats.add(current.profile)
+
+        if stack:
+            self.resume(stack[-1])
+
+    def pause(self: Self, phase: Phase) -> None:
+        if phase.profile is not None:
+            phase.profile.disable()
+
+    def resume(self: Self, phase: Phase) -> None:
+        if phase.profile is None:
+            phase.profile = Profile()
+
+        try:
+            phase.profile.enable()
+            phase.profiled = True
+        except ValueError as err:
+            # Python 3.12+ allows a single profiler in the whole interpreter.
+            if not self.warned:
+                logger.warning(f"Phases running concurrently are not profiled: {err}")
+                self.warned = True
+
+    def observe(self: Self) -> None:
+        """Fold the process peak since the last reset into every active phase."""
+
+        if not tracemalloc.is_tracing():
+            return
+
+        peak: int = tracemalloc.get_traced_memory()[1]
+
+        for phase in self.active:
+            phase.peak = max(phase.peak, peak)
+
+        tracemalloc.reset_peak()
+
+    def dump(self: Self) -> None:
+        if not self.enabled:
+            return
+
+        with self.lock:
+            snapshot: Union[tracemalloc.Snapshot, None] = None
+
+            if tracemalloc.is_tracing():
+                # Drop the records and stats kept by the profiler itself.
+                snapshot = tracemalloc.take_snapshot().filter_traces(
+                    [tracemalloc.Filter(False, __file__, all_frames=True)]
+                )
+                tracemalloc.stop()
+
+            os.makedirs(self.directory, exist_ok=True)
+
+            merged: pstats.Stats = pstats.Stats()
+
+            for (account, name), record in sorted(self.records.items()):
+                if record.profiled:
+                    record.stats.dump_stats(
+                        os.path.join(
+                            self.directory,
+                            f"{Profiler.slug(account)}.{Profiler.slug(name)}.pstats",
+                        )
+                    )
+
+                    merged.add(record.stats)
+
+            path: str = os.path.join(self.directory, "report.txt")
+
+            with open(path, "w") as file:
+                file.write(self.report(merged, snapshot))
+
+            logger.success(f"Profiling report successfully written to {path!r}.")
+
+    def report(
+        self: Self,
+        merged: pstats.Stats,
+        snapshot: Union[tracemalloc.Snapshot, None],
+    ) -> str:
+        lines: List[str] = [
+            "{:<24} {:<16} {:>6} {:>10} {:>10} {:>16}".format(
+                "account",
+                "phase",
+                "calls",
+                "wall (s)",
+                "cpu (s)",
+                "proc peak (KiB)",
+            )
+        ]
+
+        for (account, name), record in sorted(self.records.items()):
+            lines.append(
+                "{:<24} {:<16} {:>6} {:>10.3f} {:>10.3f} {:>16.1f}".format(
+                    account[:24],
+                    name[:16],
+                    record.calls,
+                    record.wall,
+                    record.cpu,
+                    record.peak / 1024,
+                )
+            )
+
+        lines += [
+            "",
+            "wall and cpu include nested phases; proc peak is the traced memory",
+            "of the whole process while the phase ran, not a per-account figure.",
+        ]
+
+        if snapshot is not None:
+            lines += ["", "Top live allocation sites at the end of the run:"]
+
+            for stat in snapshot.statistics("lineno")[: Profiler.TOP]:
+                lines.append(f"{stat.size / 1024:>12.1f} KiB  {stat.traceback}")
+
+        lines += ["", "Merged flat profile (all accounts and phases):"]
+
+        stream: io.StringIO = io.StringIO()
+        merged.stream = stream  # type: ignore[attr-defined]
+        merged.sort_stats(pstats.SortKey.TIME).print_stats(Profiler.TOP)
+        lines.append(stream.getvalue())
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def slug(value: str) -> str:
+        return re.sub(r"[^\w.-]+", "_", value) or "_"
+
+
+profiler: Profiler = Profiler(config.PROFILE_DIR)
@@ -13,6 +13,7 @@ from telethon.tl.types import InputBotAppShortName, InputPeerUser, InputUser
 from config import DEBUG
 
 from .logger import logger
+from .profiler import profiler
 
 install()
 
@@ -49,9 +50,11 @@ class Telegram(object):
                         session["api_hash"],
                     )
 
-                    async with client:
-                        me = await client.get_me()
-                        username = me.username
+                    with profiler.phase("session", str(session["api_id"])) as phase:
+                        async with client:
+                            me = await client.get_me()
+                            username = me.username
+                            phase.account = str(me.id)
 
                         logger.success(f"The client {username!r} is valid.")
 
@@ -73,35 +76,38 @@ class Telegram(object):
         data: List[str] = []
 
         for client in await self.clients:
-            async with client:
-                await client.get_me()
-                bot = await client.get_entity(bot_username)
-                peer = InputPeerUser(bot.id, bot.access_hash)
-                app = InputBotAppShortName(
-                    bot_id=InputUser(
-                        user_id=peer.user_id,
-                        access_hash=peer.access_hash,
-                    ),
-                    short_name=bot_shortname,
-                )
-
-                web_view = await client(
-                    RequestAppWebViewRequest(
-                        peer=peer,
-                        app=app,
-                        platform="android",
-                        write_allowed=True,
-                        start_param=start_param,
+            with profiler.phase("web_data", str(client.api_id)) as phase:
+                async with client:
+                    me = await client.get_me()
+                    phase.account = str(me.id)
+
+                    bot = await client.get_entity(bot_username)
+                    peer = InputPeerUser(bot.id, bot.access_hash)
+                    app = InputBotAppShortName(
+                        bot_id=InputUser(
+                            user_id=peer.user_id,
+                            access_hash=peer.access_hash,
+                        ),
+                        short_name=bot_shortname,
                     )
-                )
-                webview_url = web_view.url
-
-                tg_web_data = unquote(
-                    string=webview_url.split("tgWebAppData=")[1].split(
-                        "&tgWebAppVersion"
-                    )[0]
-                )
-                data.append(tg_web_data)
+
+                    web_view = await client(
+                        RequestAppWebViewRequest(
+                            peer=peer,
+                            app=app,
+                            platform="android",
+                            write_allowed=True,
+                            start_param=start_param,
+                        )
+                    )
+                    webview_url = web_view.url
+
+                    tg_web_data = unquote(
+                        string=webview_url.split("tgWebAppData=")[1].split(
+                            "&tgWebAppVersion"
+                        )[0]
+                    )
+                    data.append(tg_web_data)
 
         return data
 
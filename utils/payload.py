@@ -7,9 +7,13 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.hashes import SHA256
 
+from .core.profiler import profiler
+
 
 def create_payload_local(game_id: str, clover, freeze, bombs=0, dogs=0):
-    challenge = generate_challenge(game_id=game_id)
+    with profiler.phase("challenge"):
+        challenge = generate_challenge(game_id=game_id)
+
     game_data = {
         "version": 1.2,
         "gameId": game_id,
@@ -26,7 +30,8 @@ def create_payload_local(game_id: str, clover, freeze, bombs=0, dogs=0):
         "isNode": False,
     }
 
-    return encrypt_payload(json.dumps(game_data, separators=(",", ":")))
+    with profiler.phase("encrypt"):
+        return encrypt_payload(json.dumps(game_data, separators=(",", ":")))
 
 
 def generate_challenge(game_id: str, difficulty: int = 4) -> dict: